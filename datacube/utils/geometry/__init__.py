@@ -4,15 +4,21 @@
 from ._base import (
     Coordinate,
     BoundingBox,
+    BoundingBoxArray,
+    BBoxAccumulator,
+    BBoxReducer,
     InvalidCRSError,
     CRS,
     Geometry,
     GeoBox,
     bbox_union,
     bbox_intersection,
+    bbox_union_intersection,
+    bbox_intersection_matrix,
     geobox_union_conservative,
     geobox_intersection_conservative,
     intersects,
+    intersects_many,
     scaled_down_geobox,
     point,
     multipoint,
@@ -60,15 +66,21 @@ from ._warp import (
 __all__ = [
     "Coordinate",
     "BoundingBox",
+    "BoundingBoxArray",
+    "BBoxAccumulator",
+    "BBoxReducer",
     "InvalidCRSError",
     "CRS",
     "Geometry",
     "GeoBox",
     "bbox_union",
     "bbox_intersection",
+    "bbox_union_intersection",
+    "bbox_intersection_matrix",
     "geobox_union_conservative",
     "geobox_intersection_conservative",
     "intersects",
+    "intersects_many",
     "point",
     "multipoint",
     "line",
@@ -1,6 +1,7 @@
 import functools
-import itertools
 import math
+import struct
+import threading
 from collections import namedtuple, OrderedDict
 from typing import Tuple, Callable, Iterable, List
 
@@ -10,17 +11,23 @@ from affine import Affine
 from osgeo import ogr, osr
 
 from .tools import roi_normalise, roi_shape, is_affine_st
-from ..math import is_almost_int
+from ..py import cached_property
 
 Coordinate = namedtuple('Coordinate', ('values', 'units', 'resolution'))
 _BoundingBox = namedtuple('BoundingBox', ('left', 'bottom', 'right', 'top'))
 
 # pylint: disable=too-many-lines
 
+_POS_INF = math.inf
+_NEG_INF = -math.inf
+_UNSET = object()
+
 
 class BoundingBox(_BoundingBox):
     """Bounding box, defining extent in cartesian coordinates.
     """
+    # no per-instance __dict__, just the namedtuple storage
+    __slots__ = ()
 
     def buffered(self, ybuff, xbuff):
         """
@@ -41,12 +48,18 @@ class BoundingBox(_BoundingBox):
     def height(self):
         return self.top - self.bottom
 
+    @property
+    def is_empty(self) -> bool:
+        """True when left > right or bottom > top, e.g. the result of :py:func:`bbox_intersection` on disjoint boxes
+        """
+        return self.left > self.right or self.bottom > self.top
+
     @property
     def points(self) -> List[Tuple[float, float]]:
         """Extract four corners of the bounding box
         """
         x0, y0, x1, y1 = self
-        return list(itertools.product((x0, x1), (y0, y1)))
+        return [(x0, y0), (x0, y1), (x1, y0), (x1, y1)]
 
     def transform(self, transform: Affine) -> 'BoundingBox':
         """Transform bounding box through a linear transform
@@ -54,10 +67,14 @@ class BoundingBox(_BoundingBox):
            Apply linear transform on 4 points of the bounding box and compute
            bounding box of these four points.
         """
-        pts = [transform*pt for pt in self.points]
-        xx = [x for x, _ in pts]
-        yy = [y for _, y in pts]
-        return BoundingBox(min(xx), min(yy), max(xx), max(yy))
+        # x' = a*x + b*y + c is a sum of a term in x and a term in y, so the
+        # extremes over the four corners can be assembled term by term
+        sa, sb, sc, sd, se, sf, *_ = transform
+        x0, y0, x1, y1 = self
+        xa, yb = (x0*sa, x1*sa), (y0*sb, y1*sb)
+        xd, ye = (x0*sd, x1*sd), (y0*se, y1*se)
+        return BoundingBox(min(xa) + min(yb) + sc, min(xd) + min(ye) + sf,
+                           max(xa) + max(yb) + sc, max(xd) + max(ye) + sf)
 
 
 class CRSProjProxy(object):
@@ -72,8 +89,20 @@ class InvalidCRSError(ValueError):
     pass
 
 
-@cachetools.cached({})
+def _normalise_crs_str(crs_str):
+    """ Spellings of the same EPSG code ('epsg:4326', ' EPSG:4326') map to one string, and so one cache slot
+    """
+    key = crs_str.strip()
+    if key[:5].upper() == 'EPSG:':
+        return key.upper()
+    return crs_str
+
+
+# LRUCache reorders on every hit and evicts on insert, so it must not be touched by two threads at once
+@cachetools.cached(cachetools.LRUCache(maxsize=256), lock=threading.Lock())
 def _make_crs(crs_str):
+    """ Parse a CRS string, callers pass it through `_normalise_crs_str` first
+    """
     crs = osr.SpatialReference()
 
     # We don't bother checking the return code for errors, as the below ExportToProj4 does a more thorough job.
@@ -95,6 +124,7 @@ class CRS(object):
     Wrapper around `osr.SpatialReference` providing a more pythonic interface
 
     """
+    __slots__ = ('crs_str', '_crs', '_hash', '_wkt', '_epsg', '_geographic', '_projected', '_units')
 
     def __init__(self, crs_str):
         """
@@ -108,7 +138,14 @@ class CRS(object):
             crs_str = to_wkt()
 
         self.crs_str = crs_str
-        self._crs = _make_crs(crs_str)
+        self._crs = _make_crs(_normalise_crs_str(crs_str))
+        self._hash = None
+        self._wkt = None
+        self._epsg = _UNSET
+        # Kind of CRS never changes, query osr once rather than on every access
+        self._geographic = self._crs.IsGeographic() == 1
+        self._projected = self._crs.IsProjected() == 1
+        self._units = None
         # compatible with GDAL 3.0+
         try:
             self._crs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
@@ -130,7 +167,9 @@ class CRS(object):
 
         :type: str
         """
-        return self._crs.ExportToWkt()
+        if self._wkt is None:
+            self._wkt = self._crs.ExportToWkt()
+        return self._wkt
 
     @property
     def wkt(self):
@@ -148,13 +187,15 @@ class CRS(object):
 
         :type: int | None
         """
-        code = None
-        if self.projected:
-            code = self._crs.GetAuthorityCode('PROJCS')
-        elif self.geographic:
-            code = self._crs.GetAuthorityCode('GEOGCS')
+        if self._epsg is _UNSET:
+            code = None
+            if self._projected:
+                code = self._crs.GetAuthorityCode('PROJCS')
+            elif self._geographic:
+                code = self._crs.GetAuthorityCode('GEOGCS')
+            self._epsg = None if code is None else int(code)
 
-        return None if code is None else int(code)
+        return self._epsg
 
     @property
     def proj(self):
@@ -177,14 +218,14 @@ class CRS(object):
         """
         :type: bool
         """
-        return self._crs.IsGeographic() == 1
+        return self._geographic
 
     @property
     def projected(self):
         """
         :type: bool
         """
-        return self._crs.IsProjected() == 1
+        return self._projected
 
     @property
     def dimensions(self):
@@ -193,10 +234,10 @@ class CRS(object):
 
         :type: (str,str)
         """
-        if self.geographic:
+        if self._geographic:
             return 'latitude', 'longitude'
 
-        if self.projected:
+        if self._projected:
             return 'y', 'x'
 
         raise ValueError('Neither projected nor geographic')
@@ -208,11 +249,14 @@ class CRS(object):
 
         :type: (str,str)
         """
-        if self.geographic:
+        if self._geographic:
             return 'degrees_north', 'degrees_east'
 
-        if self.projected:
-            return self['UNIT'], self['UNIT']
+        if self._projected:
+            if self._units is None:
+                unit = self['UNIT']
+                self._units = (unit, unit)
+            return self._units
 
         raise ValueError('Neither projected nor geographic')
 
@@ -220,7 +264,12 @@ class CRS(object):
         return self.crs_str
 
     def __hash__(self):
-        return hash(self.to_wkt())
+        if self._hash is None:
+            # most CRSs have an EPSG code, hashing that is cheaper than serialising WKT, and
+            # also agrees between equal CRSs whose WKT differs in formatting
+            code = self.epsg
+            self._hash = hash(code) if code is not None else hash(self.to_wkt())
+        return self._hash
 
     def __repr__(self):
         return "CRS('%s')" % self.crs_str
@@ -229,12 +278,16 @@ class CRS(object):
         if other is self:
             return True
         if isinstance(other, str):
+            if other == self.crs_str:
+                return True
             other = CRS(other)
         elif not isinstance(other, CRS):
             to_wkt = getattr(other, 'to_wkt', None)
             if to_wkt is None:
                 return False
             other = CRS(to_wkt())
+        if self.crs_str == other.crs_str:
+            return True
         gdal_thinks_issame = self._crs.IsSame(other._crs) == 1  # pylint: disable=protected-access
         if gdal_thinks_issame:
             return True
@@ -246,14 +299,40 @@ class CRS(object):
         return proj4_repr_is_same
 
     def __ne__(self, other):
+        if other is self:
+            return False
         if isinstance(other, str):
+            if other == self.crs_str:
+                return False
             other = CRS(other)
         assert isinstance(other, self.__class__)
+        if self.crs_str == other.crs_str:
+            return False
         return self._crs.IsSame(other._crs) != 1  # pylint: disable=protected-access
 
 
+_osr_transforms = threading.local()
+
+
 def mk_osr_point_transform(src_crs, dst_crs):
-    return osr.CoordinateTransformation(src_crs._crs, dst_crs._crs)  # pylint: disable=protected-access
+    """
+    Construct (or fetch previously constructed) transformation from `src_crs` to `dst_crs`.
+
+    Building a transformation is much more expensive than applying it, so instances
+    are cached per pair of CRS strings, same as `_make_crs` caches parsed CRSs.
+    OGR transformations are not safe to share between threads, so every thread keeps
+    its own bounded cache, large enough for batch jobs spanning a few dozen UTM zones.
+    """
+    cache = getattr(_osr_transforms, 'cache', None)
+    if cache is None:
+        cache = _osr_transforms.cache = cachetools.LRUCache(maxsize=150)
+
+    key = (src_crs.crs_str, dst_crs.crs_str)
+    transform = cache.get(key)
+    if transform is None:
+        # pylint: disable=protected-access
+        transform = cache[key] = osr.CoordinateTransformation(src_crs._crs, dst_crs._crs)
+    return transform
 
 
 def mk_point_transformer(src_crs: CRS, dst_crs: CRS) -> Callable[
@@ -271,16 +350,20 @@ def mk_point_transformer(src_crs: CRS, dst_crs: CRS) -> Callable[
     def transform(x: numpy.ndarray, y: numpy.ndarray) -> Tuple[numpy.ndarray, numpy.ndarray]:
         assert x.shape == y.shape
 
-        xy = numpy.vstack([x.ravel(), y.ravel()])
-        xy = numpy.vstack(tr.TransformPoints(xy.T)).T[:2]
+        # Single conversion of the transformed point list into an Nx3 array,
+        # rather than building an array per point and stacking them
+        xy = numpy.column_stack([x.ravel(), y.ravel()])
+        xy = numpy.array(tr.TransformPoints(xy), dtype='float64').reshape(-1, 3)
 
-        x_ = xy[0].reshape(x.shape)
-        y_ = xy[1].reshape(y.shape)
+        x_ = xy[:, 0].reshape(x.shape)
+        y_ = xy[:, 1].reshape(y.shape)
 
-        # ogr doesn't seem to deal with NaNs properly
-        missing = numpy.isnan(x) + numpy.isnan(y)
-        x_[missing] = numpy.nan
-        y_[missing] = numpy.nan
+        # ogr doesn't seem to deal with NaNs properly, inputs are usually NaN free so skip the scatter then
+        missing = numpy.isnan(x)
+        missing |= numpy.isnan(y)
+        if missing.any():
+            x_[missing] = numpy.nan
+            y_[missing] = numpy.nan
 
         return (x_, y_)
 
@@ -294,7 +377,7 @@ def mk_point_transformer(src_crs: CRS, dst_crs: CRS) -> Callable[
 def _make_point(pt):
     geom = ogr.Geometry(ogr.wkbPoint)
     # Ignore the third dimension
-    geom.AddPoint_2D(*pt[0:2])
+    geom.AddPoint_2D(pt[0], pt[1])
     return geom
 
 
@@ -307,9 +390,10 @@ def _make_multi(type_, maker, coords):
 
 def _make_linear(type_, coordinates):
     geom = ogr.Geometry(type_)
+    add_point = geom.AddPoint_2D
     for pt in coordinates:
-        # Ignore the third dimension
-        geom.AddPoint_2D(*pt[0:2])
+        # Ignore the third dimension, index rather than slice to avoid a temporary per point
+        add_point(pt[0], pt[1])
     return geom
 
 
@@ -338,7 +422,53 @@ def _make_multipolygon(coordinates):
 ###################################################
 
 
+def _wkb_points(buf, offset):
+    count, = struct.unpack_from('<I', buf, offset)
+    offset += 4
+    end = offset + 16 * count
+    return list(struct.iter_unpack('<2d', buf[offset:end])), end
+
+
+def _wkb_coordinates(buf, offset=0):
+    """
+    Decode little-endian 2D WKB into GeoJSON style coordinates, Point through MultiPolygon except MultiPoint
+
+    :returns: (coordinates, offset past the decoded geometry)
+    :raises ValueError: on any other geometry type (Z/M variants, collections)
+    """
+    geom_type, = struct.unpack_from('<I', buf, offset + 1)
+    offset += 5
+    if geom_type == ogr.wkbPoint:
+        return struct.unpack_from('<2d', buf, offset), offset + 16
+    if geom_type == ogr.wkbLineString:
+        return _wkb_points(buf, offset)
+    if geom_type not in (ogr.wkbPolygon, ogr.wkbMultiLineString, ogr.wkbMultiPolygon):
+        raise ValueError('Unsupported WKB geometry type: %d' % geom_type)
+
+    count, = struct.unpack_from('<I', buf, offset)
+    offset += 4
+    read_part = _wkb_points if geom_type == ogr.wkbPolygon else _wkb_coordinates
+    parts = []
+    for _ in range(count):
+        part, offset = read_part(buf, offset)
+        parts.append(part)
+    return parts, offset
+
+
 def _get_coordinates(geom):
+    """
+    extract coordinates from geometry
+    """
+    if not geom.IsEmpty():
+        # decoding WKB in one go avoids a SWIG round trip per part and ring
+        try:
+            return _wkb_coordinates(memoryview(geom.ExportToWkb(ogr.wkbNDR)))[0]
+        except ValueError:
+            pass
+    return _get_coordinates_recursive(geom)
+
+
+def _get_coordinates_recursive(geom):
     """
     recursively extract coordinates from geometry
     """
@@ -347,7 +477,7 @@ def _get_coordinates(geom):
     if geom.GetGeometryType() in [ogr.wkbMultiPoint, ogr.wkbLineString, ogr.wkbLinearRing]:
         return geom.GetPoints()
     else:
-        return [_get_coordinates(geom.GetGeometryRef(i)) for i in range(geom.GetGeometryCount())]
+        return [_get_coordinates_recursive(geom.GetGeometryRef(i)) for i in range(geom.GetGeometryCount())]
 
 
 def _make_geom_from_ogr(geom, crs):
@@ -364,6 +494,10 @@ def _make_geom_from_ogr(geom, crs):
 #############################################
 
 
+# ISO WKT when this GDAL provides it, resolved once rather than per call
+_export_wkt = getattr(ogr.Geometry, 'ExportToIsoWkt', ogr.Geometry.ExportToWkt)
+
+
 def _wrap_binary_bool(method):
     @functools.wraps(method, assigned=('__doc__', ))
     def wrapped(self, other):
@@ -391,6 +525,8 @@ class Geometry(object):
     :type _geom: ogr.Geometry
     :type crs: CRS
     """
+    __slots__ = ('_geom', 'crs')
+
     _geom_makers = {
         'Point': _make_point,
         'MultiPoint': _make_multipoint,
@@ -477,7 +613,7 @@ class Geometry(object):
 
     @property
     def wkt(self):
-        return getattr(self._geom, 'ExportToIsoWkt', self._geom.ExportToWkt)()
+        return _export_wkt(self._geom)
 
     @property
     def json(self):
@@ -535,12 +671,15 @@ class Geometry(object):
             resolution = 1 if self.crs.geographic else 100000
 
         transform = mk_osr_point_transform(self.crs, crs)
-        clone = self._geom.Clone()
+        geom = self._geom
 
         if wrapdateline and crs.geographic:
             rtransform = mk_osr_point_transform(crs, self.crs)
-            clone = _chop_along_antimeridian(clone, transform, rtransform)
+            geom = _chop_along_antimeridian(geom, transform, rtransform)
 
+        # Chopping doesn't modify its input and returns a new geometry when it
+        # cuts, so only copy when we still hold our own geometry
+        clone = geom.Clone() if geom is self._geom else geom
         clone.Segmentize(resolution)
         # Segmentize can cause issues with polygons using GDAL 2.4.1
         # See: https://github.com/OSGeo/gdal/issues/1414
@@ -554,10 +693,10 @@ class Geometry(object):
             yield _make_geom_from_ogr(self._geom.GetGeometryRef(i), self.crs)
 
     def __nonzero__(self):
-        return not self.is_empty
+        return not self._geom.IsEmpty()
 
     def __bool__(self):
-        return not self.is_empty
+        return not self._geom.IsEmpty()
 
     def __eq__(self, other):
         return (hasattr(other, 'crs') and self.crs == other.crs and
@@ -579,10 +718,6 @@ class Geometry(object):
         self.__init__(**state)
 
 
-def _dist(x, y):
-    return x*x + y*y
-
-
 def _chop_along_antimeridian(geom, transform, rtransform):
     """
     attempt to cut the geometry along the dateline
@@ -624,16 +759,20 @@ def _is_smooth_across_dateline(mid_lat, transform, rtransform, eps):
     test whether the CRS is smooth over the dateline
     idea borrowed from IsAntimeridianProjToWGS84 with minor mods...
     """
-    left_of_dt_x, left_of_dt_y, _ = rtransform.TransformPoint(180-eps, mid_lat)
-    right_of_dt_x, right_of_dt_y, _ = rtransform.TransformPoint(-180+eps, mid_lat)
+    # probe both sides of the dateline in one call per direction
+    (left_of_dt_x, left_of_dt_y, _), (right_of_dt_x, right_of_dt_y, _) = rtransform.TransformPoints(
+        [(180-eps, mid_lat), (-180+eps, mid_lat)])
 
-    if _dist(right_of_dt_x-left_of_dt_x, right_of_dt_y-left_of_dt_y) > 1:
+    # squared distances are spelled out inline, these run for every geometry crossing into geographic
+    dx, dy = right_of_dt_x - left_of_dt_x, right_of_dt_y - left_of_dt_y
+    if dx*dx + dy*dy > 1:
         return False
 
-    left_of_dt_lon, left_of_dt_lat, _ = transform.TransformPoint(left_of_dt_x, left_of_dt_y)
-    right_of_dt_lon, right_of_dt_lat, _ = transform.TransformPoint(right_of_dt_x, right_of_dt_y)
-    if (_dist(left_of_dt_lon - 180 + eps, left_of_dt_lat - mid_lat) > 2 * eps or
-            _dist(right_of_dt_lon + 180 - eps, right_of_dt_lat - mid_lat) > 2 * eps):
+    (left_of_dt_lon, left_of_dt_lat, _), (right_of_dt_lon, right_of_dt_lat, _) = transform.TransformPoints(
+        [(left_of_dt_x, left_of_dt_y), (right_of_dt_x, right_of_dt_y)])
+    lx, ly = left_of_dt_lon - 180 + eps, left_of_dt_lat - mid_lat
+    rx, ry = right_of_dt_lon + 180 - eps, right_of_dt_lat - mid_lat
+    if lx*lx + ly*ly > 2 * eps or rx*rx + ry*ry > 2 * eps:
         return False
 
     return True
@@ -742,9 +881,12 @@ def polygon_from_transform(width, height, transform, crs):
     :param crs: CRS
     :rtype:  Geometry
     """
-    points = [(0, 0), (0, height), (width, height), (width, 0), (0, 0)]
-    transform.itransform(points)
-    return polygon(points, crs=crs)
+    # Corners of (0, 0), (0, height), (width, height), (width, 0) computed straight from the coefficients
+    sa, sb, sc, sd, se, sf, *_ = transform
+    xw, yw = width * sa, width * sd
+    xh, yh = height * sb, height * se
+    points = [(sc, sf), (xh + sc, yh + sf), (xw + xh + sc, yw + yh + sf), (xw + sc, yw + sf), (sc, sf)]
+    return _make_geom_from_ogr(_make_polygon((points,)), crs)
 
 
 ###########################################
@@ -752,6 +894,10 @@ def polygon_from_transform(width, height, transform, crs):
 ###########################################
 
 
+# UnionCascaded is deprecated in favour of the faster GEOS unary union (GDAL 3.7+)
+_unary_union = getattr(ogr.Geometry, 'UnaryUnion', ogr.Geometry.UnionCascaded)
+
+
 def unary_union(geoms):
     """
     compute union of multiple (multi)polygons efficiently
@@ -760,18 +906,22 @@ def unary_union(geoms):
     geom = ogr.Geometry(ogr.wkbMultiPolygon)
     crs = None
     for g in geoms:
-        if crs:
-            assert crs == g.crs
-        else:
+        if crs is None:
             crs = g.crs
-        if g._geom.GetGeometryType() == ogr.wkbPolygon:
+        else:
+            assert crs == g.crs
+        geom_type = g._geom.GetGeometryType()
+        if geom_type == ogr.wkbPolygon:
             geom.AddGeometry(g._geom)
-        elif g._geom.GetGeometryType() == ogr.wkbMultiPolygon:
+        elif geom_type == ogr.wkbMultiPolygon:
             for poly in g._geom:
                 geom.AddGeometry(poly)
         else:
             raise ValueError('"%s" is not supported' % g.type)
-    union = geom.UnionCascaded()
+    if geom.GetGeometryCount() == 0:
+        # UnaryUnion returns an empty geometry here where UnionCascaded returns NULL, keep returning None
+        return None
+    union = _unary_union(geom)
     return _make_geom_from_ogr(union, crs)
 
 
@@ -779,7 +929,36 @@ def unary_intersection(geoms):
     """
     compute intersection of multiple (multi)polygons
     """
-    return functools.reduce(Geometry.intersection, geoms)
+    # pylint: disable=protected-access
+    first, *rest = geoms
+    if not rest:
+        return first
+
+    crs = first.crs
+    geom = first._geom
+    for g in rest:
+        assert g.crs == crs
+        # once empty, intersecting any further can only produce an empty geometry
+        if not geom.IsEmpty():
+            geom = geom.Intersection(g._geom)
+
+    return _make_geom_from_ogr(geom, crs)
+
+
+def _translate_pix(affine, tx, ty):
+    """
+    Same as ``affine * Affine.translation(tx, ty)``, without building the intermediate transform
+    """
+    a, b, c, d, e, f, *_ = affine
+    return Affine(a, b, a * tx + b * ty + c, d, e, d * tx + e * ty + f)
+
+
+def _scale_pix(affine, sx, sy):
+    """
+    Same as ``affine * Affine.scale(sx, sy)``, without building the intermediate transform
+    """
+    a, b, c, d, e, f, *_ = affine
+    return Affine(a * sx, b * sy, c, d * sx, e * sy, f)
 
 
 def _align_pix(left, right, res, off):
@@ -805,13 +984,11 @@ def _align_pix(left, right, res, off):
     >>> "%.2f %d" % _align_pix(20, 30, -10, -3)
     '37.00 2'
     """
-    if res < 0:
-        res = -res
-        val = math.ceil((right - off) / res) * res + off
-        width = max(1, int(math.ceil((val - left - 0.1 * res) / res)))
-    else:
-        val = math.floor((left - off) / res) * res + off
-        width = max(1, int(math.ceil((right - val - 0.1 * res) / res)))
+    # dividing by a negative resolution turns ceil into floor, so snapping `right`
+    # for res < 0 is the same expression as snapping `left` for res > 0
+    edge, far = (left, right) if res > 0 else (right, left)
+    val = math.floor((edge - off) / res) * res + off
+    width = max(1, math.ceil((far - val - 0.1 * res) / res))
     return val, width
 
 
@@ -823,6 +1000,8 @@ class GeoBox(object):
     :param geometry.CRS crs: Coordinate Reference System
     :param affine.Affine affine: Affine transformation defining the location of the geobox
     """
+    # __dict__ is kept for the cached extent and coordinates
+    __slots__ = ('width', 'height', 'affine', '_crs', '__dict__')
 
     def __init__(self, width, height, affine, crs):
         assert is_affine_st(affine), "Only axis-aligned geoboxes are currently supported"
@@ -832,8 +1011,16 @@ class GeoBox(object):
         self.height = height
         #: :rtype: affine.Affine
         self.affine = affine
-        #: :rtype: geometry.Geometry
-        self.extent = polygon_from_transform(width, height, affine, crs=crs)
+        self._crs = crs
+
+    @cached_property
+    def extent(self):
+        """
+        Footprint of the GeoBox, built on first use as many GeoBoxes only ever need their grid
+
+        :rtype: geometry.Geometry
+        """
+        return polygon_from_transform(self.width, self.height, self.affine, crs=self._crs)
 
     @classmethod
     def from_geopolygon(cls, geopolygon, resolution, crs=None, align=None):
@@ -856,7 +1043,7 @@ class GeoBox(object):
         bounding_box = geopolygon.boundingbox
         offx, width = _align_pix(bounding_box.left, bounding_box.right, resolution[1], align[1])
         offy, height = _align_pix(bounding_box.bottom, bounding_box.top, resolution[0], align[0])
-        affine = (Affine.translation(offx, offy) * Affine.scale(resolution[1], resolution[0]))
+        affine = Affine(resolution[1], 0.0, offx, 0.0, resolution[0], offy)
         return GeoBox(crs=crs, affine=affine, width=width, height=height)
 
     def buffered(self, ybuff, xbuff):
@@ -864,7 +1051,7 @@ class GeoBox(object):
         Produce a tile buffered by ybuff, xbuff (in CRS units)
         """
         by, bx = (_round_to_res(buf, res) for buf, res in zip((ybuff, xbuff), self.resolution))
-        affine = self.affine * Affine.translation(-bx, -by)
+        affine = _translate_pix(self.affine, -bx, -by)
 
         return GeoBox(width=self.width + 2*bx,
                       height=self.height + 2*by,
@@ -888,7 +1075,7 @@ class GeoBox(object):
         ty, tx = [s.start for s in roi]
         h, w = roi_shape(roi)
 
-        affine = self.affine * Affine.translation(tx, ty)
+        affine = _translate_pix(self.affine, tx, ty)
 
         return GeoBox(width=w, height=h, affine=affine, crs=self.crs)
 
@@ -922,7 +1109,7 @@ class GeoBox(object):
         """
         :rtype: CRS
         """
-        return self.extent.crs
+        return self._crs
 
     @property
     def dimensions(self):
@@ -951,23 +1138,40 @@ class GeoBox(object):
         """
         return self.affine.yoff % abs(self.affine.e), self.affine.xoff % abs(self.affine.a)
 
+    @cached_property
+    def _coordinate_labels(self):
+        # pixel centre labels are computed once per GeoBox and shared, hence read-only
+        yres, xres = self.resolution
+        yoff, xoff = self.affine.yoff, self.affine.xoff
+
+        # scale and offset in place, so that only one array is allocated per axis
+        xs = numpy.arange(self.width, dtype='float64')
+        xs *= xres
+        xs += xoff + xres / 2
+        ys = numpy.arange(self.height, dtype='float64')
+        ys *= yres
+        ys += yoff + yres / 2
+        xs.flags.writeable = False
+        ys.flags.writeable = False
+        return ys, xs
+
     @property
     def coordinates(self):
         """
         dict of coordinate labels
 
+        A new dict on every access, the label arrays are shared between calls and are read-only.
+
         :type: dict[str,numpy.array]
         """
         yres, xres = self.resolution
-        yoff, xoff = self.affine.yoff, self.affine.xoff
-
-        xs = numpy.arange(self.width) * xres + (xoff + xres / 2)
-        ys = numpy.arange(self.height) * yres + (yoff + yres / 2)
+        ys, xs = self._coordinate_labels
 
         crs = self.crs
+        (ydim, xdim), (yunits, xunits) = crs.dimensions, crs.units
 
-        return OrderedDict((dim, Coordinate(labels, units, res))
-                           for dim, labels, units, res in zip(crs.dimensions, (ys, xs), crs.units, (yres, xres)))
+        return OrderedDict([(ydim, Coordinate(ys, yunits, yres)),
+                            (xdim, Coordinate(xs, xunits, xres))])
 
     @property
     def geographic_extent(self):
@@ -978,7 +1182,10 @@ class GeoBox(object):
             return self.extent
         return self.extent.to_crs(CRS('EPSG:4326'))
 
-    coords = coordinates
+    @property
+    def coords(self):
+        return self.coordinates
+
     dims = dimensions
 
     def __str__(self):
@@ -989,9 +1196,20 @@ class GeoBox(object):
             width=self.width,
             height=self.height,
             affine=self.affine,
-            crs=self.extent.crs
+            crs=self._crs
         )
 
+    # Only pickle the grid itself, cached extent and coordinates are rebuilt on demand
+    def __getstate__(self):
+        return {'width': self.width, 'height': self.height, 'affine': self.affine, 'crs': self._crs}
+
+    def __setstate__(self, state):
+        if 'crs' not in state:
+            # pickled before GeoBox had __slots__: width, height, affine and extent, crs comes from extent
+            state = dict(state)
+            state['crs'] = state.pop('extent').crs
+        self.__init__(**state)
+
     def __eq__(self, other):
         if not isinstance(other, GeoBox):
             return False
@@ -1009,18 +1227,34 @@ def bounding_box_in_pixel_domain(geobox: GeoBox, reference: GeoBox) -> BoundingB
     are related by whole pixel translation,
     otherwise raises `ValueError`.
     """
+    return _bounding_box_in_pixel_domain(geobox, reference, ~reference.affine)
+
+
+def _bounding_box_in_pixel_domain(geobox: GeoBox, reference: GeoBox, inv_ref: Affine) -> BoundingBox:
+    """ :py:func:`bounding_box_in_pixel_domain` with ``~reference.affine`` supplied by the caller """
     tol = 1.e-8
 
     if reference.crs != geobox.crs:
         raise ValueError("Cannot combine geoboxes in different CRSs")
 
-    a, b, c, d, e, f, *_ = ~reference.affine * geobox.affine
+    # expand inv_ref * geobox.affine by hand and compare scalars directly, numpy.isclose
+    # on python floats dominated the cost of this function
+    ra, rb, rc, rd, re, rf, *_ = inv_ref
+    ga, gb, gc, gd, ge, gf, *_ = geobox.affine
+    c = ra * gc + rb * gf + rc
+    f = rd * gc + re * gf + rf
+    if not (math.isfinite(c) and math.isfinite(f)):
+        # round() would raise its own OverflowError/ValueError on these
+        raise ValueError("Incompatible grids")
+    tx, ty = round(c), round(f)
 
-    if not (numpy.isclose(a, 1) and numpy.isclose(b, 0) and is_almost_int(c, tol)
-            and numpy.isclose(d, 0) and numpy.isclose(e, 1) and is_almost_int(f, tol)):
+    # same tolerances as numpy.isclose defaults: |x - y| <= atol + rtol*|y|
+    one_tol, zero_tol = 1.e-8 + 1.e-5, 1.e-8
+    if not (abs(c - tx) < tol and abs(f - ty) < tol and
+            abs(ra * ga + rb * gd - 1) <= one_tol and abs(ra * gb + rb * ge) <= zero_tol and
+            abs(rd * ga + re * gd) <= zero_tol and abs(rd * gb + re * ge - 1) <= one_tol):
         raise ValueError("Incompatible grids")
 
-    tx, ty = round(c), round(f)
     return BoundingBox(tx, ty, tx + geobox.width, ty + geobox.height)
 
 
@@ -1030,11 +1264,12 @@ def geobox_union_conservative(geoboxes: List[GeoBox]) -> GeoBox:
         raise ValueError("No geoboxes supplied")
 
     reference, *_ = geoboxes
+    inv_ref = ~reference.affine
 
-    bbox = bbox_union(bounding_box_in_pixel_domain(geobox, reference=reference)
+    bbox = bbox_union(_bounding_box_in_pixel_domain(geobox, reference, inv_ref)
                       for geobox in geoboxes)
 
-    affine = reference.affine * Affine.translation(*bbox[:2])
+    affine = _translate_pix(reference.affine, bbox.left, bbox.bottom)
 
     return GeoBox(width=bbox.width, height=bbox.height, affine=affine, crs=reference.crs)
 
@@ -1047,17 +1282,16 @@ def geobox_intersection_conservative(geoboxes: List[GeoBox]) -> GeoBox:
         raise ValueError("No geoboxes supplied")
 
     reference, *_ = geoboxes
+    inv_ref = ~reference.affine
 
-    bbox = bbox_intersection(bounding_box_in_pixel_domain(geobox, reference=reference)
+    bbox = bbox_intersection(_bounding_box_in_pixel_domain(geobox, reference, inv_ref)
                              for geobox in geoboxes)
 
-    # standardise empty geobox representation
-    if bbox.left > bbox.right:
-        bbox = BoundingBox(left=bbox.left, bottom=bbox.bottom, right=bbox.left, top=bbox.top)
-    if bbox.bottom > bbox.top:
-        bbox = BoundingBox(left=bbox.left, bottom=bbox.bottom, right=bbox.right, top=bbox.bottom)
+    # standardise empty geobox representation: collapse inverted edges onto left/bottom
+    left, bottom, right, top = bbox
+    bbox = BoundingBox(left=left, bottom=bottom, right=max(left, right), top=max(bottom, top))
 
-    affine = reference.affine * Affine.translation(*bbox[:2])
+    affine = _translate_pix(reference.affine, bbox.left, bbox.bottom)
 
     return GeoBox(width=bbox.width, height=bbox.height, affine=affine, crs=reference.crs)
 
@@ -1074,12 +1308,13 @@ def scaled_down_geobox(src_geobox, scaler: int):
     """
     assert scaler > 1
 
-    H, W = [X//scaler + (1 if X % scaler else 0)
-            for X in src_geobox.shape]
+    # ceil division on ints
+    H = -(-src_geobox.height // scaler)
+    W = -(-src_geobox.width // scaler)
 
     # Since 0,0 is at the corner of a pixel, not center, there is no
     # translation between pixel plane coords due to scaling
-    A = src_geobox.transform * Affine.scale(scaler, scaler)
+    A = _scale_pix(src_geobox.transform, scaler, scaler)
 
     return GeoBox(W, H, A, src_geobox.crs)
 
@@ -1094,11 +1329,52 @@ def _round_to_res(value, res, acc=0.1):
     0
     """
     res = abs(res)
-    return int(math.ceil((value - 0.1 * res) / res))
+    # math.ceil already returns an int
+    return math.ceil((value - 0.1 * res) / res)
+
+
+def _envelopes_disjoint(a_env, b_env):
+    """ Envelopes as returned by ogr GetEnvelope: (minx, maxx, miny, maxy)
+
+    Strict comparisons, a zero width geometry on the shared edge may still intersect
+    """
+    return (a_env[1] < b_env[0] or b_env[1] < a_env[0] or
+            a_env[3] < b_env[2] or b_env[3] < a_env[2])
 
 
 def intersects(a, b):
-    return a.intersects(b) and not a.touches(b)
+    # i.e. interiors intersect, check CRS once and query ogr directly rather than via two wrapped predicates
+    # pylint: disable=protected-access
+    assert a.crs == b.crs
+    # Cheap envelope test first, saves both GEOS calls for geometries that are far apart
+    if _envelopes_disjoint(a._geom.GetEnvelope(), b._geom.GetEnvelope()):
+        return False
+    return bool(a._geom.Intersects(b._geom)) and not a._geom.Touches(b._geom)
+
+
+def intersects_many(a, bs) -> numpy.ndarray:
+    """
+    Test one geometry against many with :py:func:`intersects`, as a boolean array
+
+    Still one GEOS test per element of ``bs``, only the envelope of ``a`` and its bound
+    predicates are looked up once rather than per pair.
+
+    :param Geometry a: geometry to test against
+    :param bs: iterable of geometries, all in the same CRS as ``a``
+    :returns: boolean array, one entry per element of ``bs``
+    """
+    # pylint: disable=protected-access
+    crs = a.crs
+    a_env = a._geom.GetEnvelope()
+    a_intersects, a_touches = a._geom.Intersects, a._geom.Touches
+
+    def _test(b):
+        assert b.crs == crs
+        if _envelopes_disjoint(a_env, b._geom.GetEnvelope()):
+            return False
+        return a_intersects(b._geom) and not a_touches(b._geom)
+
+    return numpy.fromiter((_test(b) for b in bs), dtype=bool)
 
 
 def bbox_union(bbs: Iterable[BoundingBox]) -> BoundingBox:
@@ -1106,32 +1382,248 @@ def bbox_union(bbs: Iterable[BoundingBox]) -> BoundingBox:
     """
     # pylint: disable=invalid-name
 
-    L = B = float('+inf')
-    R = T = float('-inf')
-
-    for bb in bbs:
-        l, b, r, t = bb
-        L = min(l, L)
-        B = min(b, B)
-        R = max(r, R)
-        T = max(t, T)
+    if isinstance(bbs, numpy.ndarray) and bbs.ndim == 2 and bbs.shape[1] == 4 and bbs.shape[0] > 0:
+        # (N, 4) array of left, bottom, right, top: reduce each column in numpy
+        return BoundingBox(float(bbs[:, 0].min()), float(bbs[:, 1].min()),
+                           float(bbs[:, 2].max()), float(bbs[:, 3].max()))
+    if isinstance(bbs, BoundingBoxArray) and len(bbs) > 0:
+        return BoundingBox(float(bbs.left.min()), float(bbs.bottom.min()),
+                           float(bbs.right.max()), float(bbs.top.max()))
+
+    # Plain comparisons rather than min/max builtins, the call overhead dominates on scalars,
+    # converting to numpy first costs more than it saves for tuples of floats
+    L = B = _POS_INF
+    R = T = _NEG_INF
+
+    for l, b, r, t in bbs:
+        if l < L:
+            L = l
+        if b < B:
+            B = b
+        if r > R:
+            R = r
+        if t > T:
+            T = t
 
     return BoundingBox(L, B, R, T)
 
 
 def bbox_intersection(bbs: Iterable[BoundingBox]) -> BoundingBox:
     """ Given a stream of bounding boxes compute the overlap BoundingBox
+
+    Disjoint inputs give an empty box (left > right or bottom > top), check ``.is_empty``
+    on the result to skip further work.
     """
     # pylint: disable=invalid-name
 
-    L = B = float('-inf')
-    R = T = float('+inf')
+    if isinstance(bbs, numpy.ndarray) and bbs.ndim == 2 and bbs.shape[1] == 4 and bbs.shape[0] > 0:
+        return BoundingBox(float(bbs[:, 0].max()), float(bbs[:, 1].max()),
+                           float(bbs[:, 2].min()), float(bbs[:, 3].min()))
+    if isinstance(bbs, BoundingBoxArray) and len(bbs) > 0:
+        return BoundingBox(float(bbs.left.max()), float(bbs.bottom.max()),
+                           float(bbs.right.min()), float(bbs.top.min()))
+
+    L = B = _NEG_INF
+    R = T = _POS_INF
+
+    for l, b, r, t in bbs:
+        if l > L:
+            L = l
+        if b > B:
+            B = b
+        if r < R:
+            R = r
+        if t < T:
+            T = t
 
-    for bb in bbs:
+    return BoundingBox(L, B, R, T)
+
+
+def bbox_union_intersection(bbs: Iterable[BoundingBox]) -> Tuple[BoundingBox, BoundingBox]:
+    """ Given a stream of bounding boxes compute both the enclosing and the overlap BoundingBox
+
+    Same as ``(bbox_union(bbs), bbox_intersection(bbs))`` in a single pass, so also works on a one-shot iterator.
+    """
+    # pylint: disable=invalid-name
+
+    if ((isinstance(bbs, numpy.ndarray) and bbs.ndim == 2 and bbs.shape[1] == 4 and bbs.shape[0] > 0) or
+            (isinstance(bbs, BoundingBoxArray) and len(bbs) > 0)):
+        # arrays can be read twice, and per column 1-d reductions beat a single axis=0 pass
+        return bbox_union(bbs), bbox_intersection(bbs)
+
+    uL = uB = iR = iT = _POS_INF
+    uR = uT = iL = iB = _NEG_INF
+
+    for l, b, r, t in bbs:
+        if l < uL:
+            uL = l
+        if l > iL:
+            iL = l
+        if b < uB:
+            uB = b
+        if b > iB:
+            iB = b
+        if r > uR:
+            uR = r
+        if r < iR:
+            iR = r
+        if t > uT:
+            uT = t
+        if t < iT:
+            iT = t
+
+    return BoundingBox(uL, uB, uR, uT), BoundingBox(iL, iB, iR, iT)
+
+
+def bbox_intersection_matrix(a, b) -> numpy.ndarray:
+    """ Overlap of every box in ``a`` with every box in ``b``
+
+    :param a: ``(M, 4)`` array-like of (left, bottom, right, top)
+    :param b: ``(N, 4)`` array-like of (left, bottom, right, top)
+    :returns: ``(M, N, 4)`` float64 array, ``out[i, j]`` is ``bbox_intersection([a[i], b[j]])``,
+              so empty overlaps have left > right or bottom > top
+
+    >>> out = bbox_intersection_matrix([(0, 0, 2, 2)], [(1, 1, 3, 3), (5, 5, 6, 6)])
+    >>> out.shape, out[0, 0].tolist()
+    ((1, 2, 4), [1.0, 1.0, 2.0, 2.0])
+    """
+    a = numpy.asarray(a, dtype='float64').reshape(-1, 4)[:, None, :]
+    b = numpy.asarray(b, dtype='float64').reshape(-1, 4)[None, :, :]
+
+    out = numpy.empty((a.shape[0], b.shape[1], 4), dtype='float64')
+    numpy.maximum(a[..., :2], b[..., :2], out=out[..., :2])
+    numpy.minimum(a[..., 2:], b[..., 2:], out=out[..., 2:])
+    return out
+
+
+class BoundingBoxArray(object):
+    """
+    Many bounding boxes stored column-wise, as four float64 arrays
+
+    Accepted anywhere an iterable of :py:class:`BoundingBox` is, while :py:func:`bbox_union` and
+    :py:func:`bbox_intersection` reduce it without touching individual boxes.
+
+    >>> bbs = BoundingBoxArray.from_iter([BoundingBox(0, 0, 2, 2), BoundingBox(1, 1, 3, 3)])
+    >>> len(bbs), bbs.right.tolist()
+    (2, [2.0, 3.0])
+    >>> bbox_union(bbs)
+    BoundingBox(left=0.0, bottom=0.0, right=3.0, top=3.0)
+    """
+    __slots__ = ('left', 'bottom', 'right', 'top')
+
+    def __init__(self, left, bottom, right, top):
+        self.left, self.bottom, self.right, self.top = (numpy.asarray(v, dtype='float64')
+                                                        for v in (left, bottom, right, top))
+        assert self.left.shape == self.bottom.shape == self.right.shape == self.top.shape
+
+    @classmethod
+    def from_iter(cls, bbs: Iterable[BoundingBox]) -> 'BoundingBoxArray':
+        """ Build from an iterable of bounding boxes or (left, bottom, right, top) tuples """
+        # one contiguous row per edge
+        columns = numpy.array([tuple(bb) for bb in bbs], dtype='float64').reshape(-1, 4).T.copy()
+        return cls(*columns)
+
+    def __len__(self):
+        return len(self.left)
+
+    def __iter__(self):
+        for bb in zip(self.left.tolist(), self.bottom.tolist(), self.right.tolist(), self.top.tolist()):
+            yield BoundingBox(*bb)
+
+
+class BBoxAccumulator(object):
+    """
+    Running union of bounding boxes, for reducing a stream in pieces without keeping it around
+
+    >>> acc = BBoxAccumulator()
+    >>> acc.update(BoundingBox(0, 0, 1, 1))
+    >>> acc.update_many([BoundingBox(2, -1, 3, 0)])
+    >>> acc.result()
+    BoundingBox(left=0, bottom=-1, right=3, top=1)
+    """
+    __slots__ = ('left', 'bottom', 'right', 'top')
+
+    def __init__(self):
+        self.left = self.bottom = _POS_INF
+        self.right = self.top = _NEG_INF
+
+    def update(self, bb: BoundingBox):
+        """ Extend by a single bounding box """
         l, b, r, t = bb
-        L = max(l, L)
-        B = max(b, B)
-        R = min(r, R)
-        T = min(t, T)
+        if l < self.left:
+            self.left = l
+        if b < self.bottom:
+            self.bottom = b
+        if r > self.right:
+            self.right = r
+        if t > self.top:
+            self.top = t
 
-    return BoundingBox(L, B, R, T)
+    def update_many(self, bbs: Iterable[BoundingBox]):
+        """ Extend by a batch of bounding boxes, either an iterable or an (N, 4) array """
+        self.update(bbox_union(bbs))
+
+    def result(self) -> BoundingBox:
+        """ Enclosing BoundingBox of everything seen so far """
+        return BoundingBox(self.left, self.bottom, self.right, self.top)
+
+
+class BBoxReducer(object):
+    """
+    Union and intersection over contiguous runs of a fixed sequence of bounding boxes
+
+    Builds a sparse table of per-edge minima and maxima once (O(N log N) memory), after which
+    any ``[start, stop)`` range is answered in constant time from two overlapping power-of-two
+    blocks. Useful when the same collection of footprints is reduced over many sub-ranges.
+    For arbitrary index sets use ``bbox_union(reducer.boxes[idx])`` instead.
+
+    >>> r = BBoxReducer([BoundingBox(0, 0, 2, 2), BoundingBox(1, 1, 3, 3), BoundingBox(5, 0, 6, 1)])
+    >>> r.union(0, 2)
+    BoundingBox(left=0.0, bottom=0.0, right=3.0, top=3.0)
+    >>> r.intersection(0, 2)
+    BoundingBox(left=1.0, bottom=1.0, right=2.0, top=2.0)
+    >>> r.union(1)
+    BoundingBox(left=1.0, bottom=0.0, right=6.0, top=3.0)
+    """
+
+    def __init__(self, bbs: Iterable[BoundingBox]):
+        boxes = numpy.array([tuple(bb) for bb in bbs], dtype='float64').reshape(-1, 4)
+        boxes.setflags(write=False)
+        self.boxes = boxes
+
+        # level k holds reductions over runs of 2**k boxes starting at each index
+        self._lo = [boxes]
+        self._hi = [boxes]
+        width = 1
+        while width * 2 <= len(boxes):
+            lo, hi = self._lo[-1], self._hi[-1]
+            self._lo.append(numpy.minimum(lo[:-width], lo[width:]))
+            self._hi.append(numpy.maximum(hi[:-width], hi[width:]))
+            width *= 2
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def _reduce(self, start, stop):
+        start, stop, _ = slice(start, stop).indices(len(self.boxes))
+        n = stop - start
+        if n <= 0:
+            return None, None
+        level = n.bit_length() - 1
+        tail = stop - (1 << level)
+        lo, hi = self._lo[level], self._hi[level]
+        return numpy.minimum(lo[start], lo[tail]), numpy.maximum(hi[start], hi[tail])
+
+    def union(self, start=None, stop=None) -> BoundingBox:
+        """ Enclosing BoundingBox of ``boxes[start:stop]`` """
+        lo, hi = self._reduce(start, stop)
+        if lo is None:
+            return BoundingBox(_POS_INF, _POS_INF, _NEG_INF, _NEG_INF)
+        return BoundingBox(float(lo[0]), float(lo[1]), float(hi[2]), float(hi[3]))
+
+    def intersection(self, start=None, stop=None) -> BoundingBox:
+        """ Overlap BoundingBox of ``boxes[start:stop]`` """
+        lo, hi = self._reduce(start, stop)
+        if lo is None:
+            return BoundingBox(_NEG_INF, _NEG_INF, _POS_INF, _POS_INF)
+        return BoundingBox(float(hi[0]), float(hi[1]), float(lo[2]), float(lo[3]))
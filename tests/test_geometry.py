@@ -10,6 +10,9 @@ from datacube.utils.geometry import (
     CRS,
     BoundingBox,
     bbox_union,
+    bbox_intersection,
+    bbox_union_intersection,
+    bbox_intersection_matrix,
     decompose_rws,
     affine_from_pts,
     get_scale_at_point,
@@ -46,6 +49,19 @@ def test_pickleable():
     unpickled = pickle.loads(pickled)
     assert poly == unpickled
 
+    gbox = GeoBox(40, 30, mkA(0, (10, -10), translation=(200, 300)), epsg3577)
+    assert gbox.extent is not None  # populate cached properties before pickling
+    for protocol in (0, pickle.HIGHEST_PROTOCOL):
+        unpickled = pickle.loads(pickle.dumps(gbox, protocol))
+        assert unpickled == gbox
+        assert unpickled.extent == gbox.extent
+
+    # state layout of GeoBoxes pickled by older versions
+    old = GeoBox.__new__(GeoBox)
+    old.__setstate__({'width': 40, 'height': 30, 'affine': gbox.affine, 'extent': gbox.extent})
+    assert old == gbox
+    assert old.crs == epsg3577
+
 
 def test_geobox_simple():
     from affine import Affine
@@ -63,6 +79,13 @@ def test_geobox_simple():
     assert t.coordinates['latitude'].values.shape == (4000,)
     assert t.coordinates['longitude'].values.shape == (4000,)
 
+    # fresh dict per access around shared, read-only label arrays
+    coords = t.coordinates
+    coords.pop('latitude')
+    assert 'latitude' in t.coordinates
+    assert t.coordinates['longitude'].values is coords['longitude'].values
+    assert coords['longitude'].values.flags.writeable is False
+
     np.testing.assert_almost_equal(t.resolution, expect_resolution)
     np.testing.assert_almost_equal(t.coords['latitude'].values[:10], expect_lat)
     np.testing.assert_almost_equal(t.coords['longitude'].values[:10], expect_lon)
@@ -98,9 +121,17 @@ def test_props():
     assert bbox.width == 9
     assert bbox.height == 13
     assert bbox.points == [(1, 0), (1, 13), (10, 0), (10, 13)]
+    assert not hasattr(bbox, '__dict__')
 
     assert bbox.transform(Affine.identity()) == bbox
     assert bbox.transform(Affine.translation(1, 2)) == geometry.BoundingBox(2, 2, 11, 15)
+    assert bbox.transform(Affine.scale(2, -1)) == geometry.BoundingBox(2, -13, 20, 0)
+    assert bbox.transform(Affine(0, 1, 0, 1, 0, 0)) == geometry.BoundingBox(0, 1, 13, 10)
+
+    for A in (Affine.rotation(30), Affine.rotation(-135) * Affine.scale(3, -2), mkA(17, (2, -3), translation=(5, 7))):
+        xx, yy = zip(*[A*pt for pt in bbox.points])
+        expect = geometry.BoundingBox(min(xx), min(yy), max(xx), max(yy))
+        assert np.allclose(bbox.transform(A), expect)
 
     pt = geometry.point(3, 4, crs)
     assert pt.json['coordinates'] == (3.0, 4.0)
@@ -137,6 +168,13 @@ def test_tests():
     assert not box1.contains(box3)
     assert not box1.contains(box4)
 
+    boxes = [box1, box2, box3, box4, minibox]
+    expect = [geometry.intersects(box1, b) for b in boxes]
+    assert expect == [True, True, False, False, True]
+    assert geometry.intersects_many(box1, boxes).tolist() == expect
+    assert geometry.intersects_many(box1, iter(boxes)).tolist() == expect
+    assert geometry.intersects_many(box1, []).shape == (0,)
+
     assert minibox.within(box1)
     assert not box1.within(box2)
     assert not box1.within(box3)
@@ -200,6 +238,100 @@ def test_bbox_union():
     bb = bbox_union(iter([b2, b1]*10))
     assert bb == BoundingBox(0, 1, 11, 22)
 
+    assert bbox_union(np.asarray([b1, b2])) == BoundingBox(0, 1, 11, 22)
+    assert bbox_intersection(np.asarray([b1, b2])) == BoundingBox(5, 6, 10, 20)
+
+
+def test_bbox_array():
+    b1 = BoundingBox(0, 1, 10, 20)
+    b2 = BoundingBox(5, 6, 11, 22)
+
+    bbs = geometry.BoundingBoxArray.from_iter([b1, b2])
+    assert len(bbs) == 2
+    assert list(bbs) == [b1, b2]
+    assert bbs.top.tolist() == [20, 22]
+
+    assert bbox_union(bbs) == BoundingBox(0, 1, 11, 22)
+    assert bbox_intersection(bbs) == BoundingBox(5, 6, 10, 20)
+    assert bbox_union_intersection(bbs) == (bbox_union(bbs), bbox_intersection(bbs))
+
+    empty = geometry.BoundingBoxArray.from_iter([])
+    assert len(empty) == 0
+    assert bbox_union(empty) == bbox_union([])
+    assert bbox_intersection(geometry.BoundingBoxArray([], [], [], [])) == bbox_intersection([])
+
+
+def test_bbox_accumulator():
+    b1 = BoundingBox(0, 1, 10, 20)
+    b2 = BoundingBox(5, 6, 11, 22)
+
+    acc = geometry.BBoxAccumulator()
+    assert acc.result() == bbox_union([])
+
+    acc.update(b2)
+    assert acc.result() == b2
+    acc.update_many(iter([b1, b2]))
+    assert acc.result() == BoundingBox(0, 1, 11, 22)
+    acc.update_many(np.asarray([(-1, 0, 1, 1)]))
+    assert acc.result() == BoundingBox(-1, 0, 11, 22)
+    acc.update_many([])
+    assert acc.result() == BoundingBox(-1, 0, 11, 22)
+
+
+def test_bbox_reducer():
+    bbs = [BoundingBox(i, -i, i + 10, 20 - i) for i in range(13)]
+    reducer = geometry.BBoxReducer(bbs)
+    assert len(reducer) == 13
+
+    for start in range(13):
+        for stop in range(start + 1, 14):
+            assert reducer.union(start, stop) == bbox_union(bbs[start:stop])
+            assert reducer.intersection(start, stop) == bbox_intersection(bbs[start:stop])
+
+    assert reducer.union() == bbox_union(bbs)
+    assert reducer.union(-3) == bbox_union(bbs[-3:])
+    assert reducer.union(5, 5) == bbox_union([])
+    assert geometry.BBoxReducer([]).intersection() == bbox_intersection([])
+
+
+def test_bbox_union_intersection():
+    b1 = BoundingBox(0, 1, 10, 20)
+    b2 = BoundingBox(5, 6, 11, 22)
+
+    assert bbox_union_intersection([b1]) == (b1, b1)
+
+    union, overlap = bbox_union_intersection(iter([b1, b2]))
+    assert union == BoundingBox(0, 1, 11, 22)
+    assert overlap == BoundingBox(5, 6, 10, 20)
+    assert union == bbox_union([b2, b1])
+    assert overlap == bbox_intersection([b2, b1])
+    assert bbox_union_intersection(np.asarray([b1, b2])) == (union, overlap)
+
+    # disjoint boxes give an empty overlap, same whatever the order or container
+    b3 = BoundingBox(20, 1, 30, 20)
+    bb = bbox_intersection(iter([b1, b3, b2]))
+    assert bb == BoundingBox(20, 6, 10, 20)
+    assert bb.is_empty
+    assert bbox_intersection([b3, b2, b1]) == bb
+    assert bbox_intersection(np.asarray([b2, b1, b3])) == bb
+    assert bbox_intersection(geometry.BoundingBoxArray.from_iter([b1, b3, b2])) == bb
+    assert not overlap.is_empty
+    assert not BoundingBox(1, 1, 1, 1).is_empty
+
+
+def test_bbox_intersection_matrix():
+    aa = [BoundingBox(0, 1, 10, 20), BoundingBox(20, 1, 30, 20)]
+    bb = [BoundingBox(5, 6, 11, 22), BoundingBox(-1, 0, 40, 30), BoundingBox(100, 100, 101, 101)]
+
+    out = bbox_intersection_matrix(aa, np.asarray(bb))
+    assert out.shape == (2, 3, 4)
+    for i, a in enumerate(aa):
+        for j, b in enumerate(bb):
+            assert BoundingBox(*out[i, j]) == bbox_intersection([a, b])
+
+    assert BoundingBox(*out[1, 0]).is_empty
+    assert bbox_intersection_matrix(aa, []).shape == (2, 0, 4)
+
 
 def test_unary_union():
     box1 = geometry.box(10, 10, 30, 30, crs=epsg4326)
@@ -227,6 +359,7 @@ def test_unary_union():
     assert union4.area == 2.5 * box1.area
 
     assert geometry.unary_union([]) is None
+    assert geometry.unary_union([geometry.multipolygon([], epsg4326)]) is None
 
     with pytest.raises(ValueError):
         pt = geometry.point(6, 7, epsg4326)
@@ -582,6 +715,11 @@ def test_3d_geometry_converted_to_2d_geometry():
 
     assert g_2d == g_3d  # 3D geometry has been converted to a 2D by dropping the Z axis
 
+    # numpy arrays are accepted as coordinates
+    g_np = geometry.Geometry({'coordinates': [np.asarray(coordinates)], 'type': 'Polygon'})
+    assert {2} == set(len(pt) for pt in g_np.boundary.coords)
+    assert g_np == g_2d
+
 
 def test_3d_point_converted_to_2d_point():
     point = (-35.5029340, 145.9312455, 0.0)
@@ -627,6 +765,12 @@ def test_crs():
     assert epsg3577 != epsg4326
     assert epsg3577 != 'EPSG:4326'
 
+    # equivalent spellings of an EPSG code are parsed once, from the normalised string
+    crs = CRS(' epsg:3577 ')
+    assert crs._crs is CRS('EPSG:3577')._crs
+    assert crs.epsg == 3577
+    assert crs.crs_str == ' epsg:3577 '
+
     bad_crs = ['cupcakes',
                ('PROJCS["unnamed",'
                 'GEOGCS["WGS 84", DATUM["WGS_1984", SPHEROID["WGS 84",6378137,298.257223563, AUTHORITY["EPSG","7030"]],'
@@ -691,6 +835,28 @@ def test_geobox_scale_down():
         assert gbox_.extent.contains(gbox.extent)
 
 
+def test_geobox_intersection_conservative():
+    from itertools import permutations
+    from datacube.utils.geometry import geobox_intersection_conservative
+
+    A = mkA(0, (10, -10), translation=(100, 200))
+    gbox = GeoBox(30, 10, A, epsg3857)
+    a, b, c = gbox[0:10, 0:10], gbox[0:10, 20:30], gbox[5:8, 0:30]
+
+    assert geobox_intersection_conservative([a, c]) == gbox[5:8, 0:10]
+
+    # a and b are disjoint, empty result is the same whatever the order
+    expect = GeoBox(0, 3, A * Affine.translation(20, 5), epsg3857)
+    for gboxes in permutations([a, b, c]):
+        assert geobox_intersection_conservative(list(gboxes)) == expect
+
+    # non-finite offsets are incompatible grids like any other
+    for off in (float('inf'), float('nan')):
+        bad = GeoBox(10, 10, mkA(0, (10, -10), translation=(off, 200)), epsg3857)
+        with pytest.raises(ValueError, match='Incompatible grids'):
+            geobox_intersection_conservative([gbox, bad])
+
+
 def test_roi_tools():
     from datacube.utils.geometry import (
         roi_is_empty,
@@ -782,6 +948,15 @@ def test_point_transformer():
     tr = mk_point_transformer(epsg3857, epsg4326)
     tr_back = mk_point_transformer(epsg4326, epsg3857)
 
+    # OGR transformations are reused per CRS pair within a thread, but never shared across threads
+    from concurrent.futures import ThreadPoolExecutor
+    from datacube.utils.geometry._base import mk_osr_point_transform
+    ogr_tr = mk_osr_point_transform(epsg3857, epsg4326)
+    assert mk_osr_point_transform(geometry.CRS('EPSG:3857'), epsg4326) is ogr_tr
+    assert mk_osr_point_transform(epsg4326, epsg3857) is not ogr_tr
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        assert pool.submit(mk_osr_point_transform, epsg3857, epsg4326).result() is not ogr_tr
+
     pts = [(0, 0), (0, 1),
            (1, 2), (10, 11)]
     x, y = np.vstack(pts).astype('float64').T